@@ -13,6 +13,7 @@ from pika.adapters.blocking_connection import BlockingConnection, BlockingChanne
 from pika.spec import BasicProperties
 
 from app.notifications.email_notification_service import send_notification_email
+from app.profiling.profiler import stage_timer, start_profiling, stop_profiling
 
 
 class Consumer(Process):
@@ -68,20 +69,27 @@ class Consumer(Process):
 
         Processes all messages from the queue until the max message limit is reached.
         Self-terminates upon reaching the max message limit.
+        If profiling is enabled, per-stage timings and stack samples are collected
+        for this worker and written out on termination.
         :return:
         """
         get_logger(__name__).info(f"Beginning processing of {self.max_messages} messages "
                                   f"on worker number {self.pid}.")
-        for method_frame, properties, body in self.channel.consume(queue='email', inactivity_timeout=5):
-            self.current_message_count += 1
-            if self.current_message_count <= self.max_messages:
-                self.callback(method_frame, properties, body)
-                get_logger(__name__).info(f"Processed {self.current_message_count} of {self.max_messages} messages.")
-            else:
-                break
-        get_logger(__name__).info("All messages processed")
-        self.channel.cancel()
-        self.stop_consuming()
+        start_profiling()
+        try:
+            for method_frame, properties, body in self.channel.consume(queue='email', inactivity_timeout=5):
+                self.current_message_count += 1
+                if self.current_message_count <= self.max_messages:
+                    with stage_timer("message"):
+                        self.callback(method_frame, properties, body)
+                    get_logger(__name__).info(f"Processed {self.current_message_count} of {self.max_messages} messages.")
+                else:
+                    break
+            get_logger(__name__).info("All messages processed")
+            self.channel.cancel()
+            self.stop_consuming()
+        finally:
+            stop_profiling()
         return 0
 
 
@@ -105,15 +113,16 @@ class Consumer(Process):
         :return:
         """
         try:
-            deserialized_body: dict = json.loads(body.decode('utf-8'))
-            deserialized_flood: dict = deserialized_body.get(self.flood_key)
-            deserialized_subscriber_id: str = deserialized_body.get(self.subscriber_id_key)
-            deserialized_subscriber_email: str = deserialized_body.get(self.subscriber_email_key)
-            flood_area_id: str = deserialized_flood.get(self.flood_area_id_key)
-            flood_description: str = deserialized_flood.get(self.flood_description_key)
-            severity: str = deserialized_flood.get(self.flood_severity_key)
-            severity_level: int = int(deserialized_flood.get(self.flood_severity_level_key))
-            message: str = deserialized_flood.get(self.flood_message_key)
+            with stage_timer("decode"):
+                deserialized_body: dict = json.loads(body.decode('utf-8'))
+                deserialized_flood: dict = deserialized_body.get(self.flood_key)
+                deserialized_subscriber_id: str = deserialized_body.get(self.subscriber_id_key)
+                deserialized_subscriber_email: str = deserialized_body.get(self.subscriber_email_key)
+                flood_area_id: str = deserialized_flood.get(self.flood_area_id_key)
+                flood_description: str = deserialized_flood.get(self.flood_description_key)
+                severity: str = deserialized_flood.get(self.flood_severity_key)
+                severity_level: int = int(deserialized_flood.get(self.flood_severity_level_key))
+                message: str = deserialized_flood.get(self.flood_message_key)
             subject_colour_tuple: tuple[str, str] = set_subject_and_colour(severity_level)
             subject: str = subject_colour_tuple[0]
             colour: str = subject_colour_tuple[1]
@@ -150,7 +159,8 @@ class Consumer(Process):
         try:
             send_notification_email(subscriber_id, email, subject, flood_area_id, flood_description,
                                     severity, message, colour)
-            self.channel.basic_ack(delivery_tag=method.delivery_tag)
+            with stage_timer("ack"):
+                self.channel.basic_ack(delivery_tag=method.delivery_tag)
         except BadRequestsError:
             get_logger(__name__).error(f"Email notification service has failed for subscriber "
                               f"with the following email address: {email} \n")
@@ -16,6 +16,9 @@ try:
     rabbitmq_password = getenv("RABBITMQ_PASSWORD")
     LOG_FILE_LOCATION = getenv("LOG_FILE_LOCATION")
     BUILD = getenv("BUILD")
+    PROFILING = getenv("CONSUMER_PROFILING")
+    PROFILING_INTERVAL = getenv("CONSUMER_PROFILING_INTERVAL")
+    PROFILING_OUTPUT_LOCATION = getenv("CONSUMER_PROFILING_OUTPUT_LOCATION")
 except KeyError:
     API_KEY = 'SENDGRID_EMAIL_API_KEY'
     FROM_EMAIL = 'SENDGRID_FROM_EMAIL'
@@ -26,4 +29,7 @@ except KeyError:
     rabbitmq_user = "RABBITMQ_USER"
     rabbitmq_password = "RABBITMQ_PASSWORD"
     LOG_FILE_LOCATION = "LOG_FILE_LOCATION"
-    BUILD = "BUILD"
\ No newline at end of file
+    BUILD = "BUILD"
+    PROFILING = "CONSUMER_PROFILING"
+    PROFILING_INTERVAL = "CONSUMER_PROFILING_INTERVAL"
+    PROFILING_OUTPUT_LOCATION = "CONSUMER_PROFILING_OUTPUT_LOCATION"
\ No newline at end of file
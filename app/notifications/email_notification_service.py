@@ -7,8 +7,10 @@ from sendgrid.helpers.mail import Mail, ReplyTo
 
 from app.logging.log import get_logger
 from app.env_vars import *
+from app.profiling.profiler import stage_timer, timed
 
 
+@timed("render")
 def email_template(description: str, severity: str, message: str, url_to_flood: str,
                    unsubscribe_url: str, colour: str) -> str:
     return ("""
@@ -282,8 +284,9 @@ def send_notification_email(subscriber_id: str, email_address: str, subject: str
         html_content=content)
     message.reply_to = ReplyTo(REPLY_EMAIL)
     try:
-        sg = SendGridAPIClient(API_KEY)
-        response = sg.send(message)
+        with stage_timer("send"):
+            sg = SendGridAPIClient(API_KEY)
+            response = sg.send(message)
         get_logger(__name__).info(f"Message sent to {email_address}")
         get_logger(__name__).info(response.status_code)
         get_logger(__name__).info(response.status_code)
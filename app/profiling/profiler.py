@@ -0,0 +1,239 @@
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+from app.env_vars import PROFILING, PROFILING_INTERVAL, PROFILING_OUTPUT_LOCATION
+from app.logging.log import get_logger, log_path
+
+
+PROFILING_ENABLED: bool = (PROFILING or "").strip().lower() in ("1", "true", "yes", "on")
+DEFAULT_SAMPLING_INTERVAL = 0.005
+MIN_SAMPLING_INTERVAL = 0.001
+
+if PROFILING_OUTPUT_LOCATION:
+    profile_path = os.path.expanduser('~') + "/" + PROFILING_OUTPUT_LOCATION
+else:
+    profile_path = log_path + "/profiles"
+
+sampler = None
+
+
+def get_sampling_interval() -> float:
+    """
+    Reads the sampling interval (in seconds) from the environment.
+    Falls back to the default interval if it is missing, not finite
+    or shorter than the minimum interval.
+
+    :return: Sampling interval in seconds
+    """
+    if not PROFILING_INTERVAL:
+        return DEFAULT_SAMPLING_INTERVAL
+    try:
+        interval: float = float(PROFILING_INTERVAL)
+        if not math.isfinite(interval) or interval < MIN_SAMPLING_INTERVAL:
+            raise ValueError(f"sampling interval must be a finite number of at least {MIN_SAMPLING_INTERVAL}s")
+        return interval
+    except ValueError as e:
+        get_logger(__name__).warning(f"Invalid profiling interval '{PROFILING_INTERVAL}', "
+                                     f"using default of {DEFAULT_SAMPLING_INTERVAL}s: {e}")
+        return DEFAULT_SAMPLING_INTERVAL
+
+
+class StageStats:
+    """
+    Running call count, total time and maximum time for a single profiled stage.
+    """
+
+
+    def __init__(self):
+        """
+        Initialize the stage statistics with no recorded calls.
+        """
+        self.count: int = 0
+        self.total: float = 0.0
+        self.maximum: float = 0.0
+
+
+    def add(self, elapsed: float):
+        """
+        Adds a single timing to the statistics.
+
+        :param elapsed: Time spent in the stage, in seconds
+        :return:
+        """
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+
+
+stage_stats: dict[str, StageStats] = {}
+
+
+def record_stage(stage: str, elapsed: float):
+    """
+    Adds a single timing to the running statistics for a stage.
+
+    :param stage: Name of the stage
+    :param elapsed: Time spent in the stage, in seconds
+    :return:
+    """
+    stats = stage_stats.get(stage)
+    if stats is None:
+        stats = stage_stats[stage] = StageStats()
+    stats.add(elapsed)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Context manager which times the enclosed block as the given stage.
+    Does nothing unless profiling is enabled.
+
+    :param stage: Name of the stage
+    :return:
+    """
+    if not PROFILING_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def timed(stage: str):
+    """
+    Decorator which times every call to the decorated function as the given stage.
+    The function is returned unchanged when profiling is disabled.
+
+    :param stage: Name of the stage
+    :return:
+    """
+    def decorator(func):
+        if not PROFILING_ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class SamplingProfiler(threading.Thread):
+    """
+    Background thread which periodically samples the call stack of a target thread
+    and counts each distinct stack in collapsed (flame graph) form.
+    """
+
+
+    def __init__(self, target_thread_id: int, interval: float):
+        """
+        Initialize the sampling profiler.
+
+        :param target_thread_id: Identifier of the thread to sample
+        :param interval: Time between samples, in seconds
+        """
+        threading.Thread.__init__(self, name="consumer-sampling-profiler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.stopped = threading.Event()
+
+
+    def run(self):
+        """
+        Samples the target thread until stopped.
+        :return:
+        """
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[";".join(stack)] += 1
+
+
+    def stop(self):
+        """
+        Stops sampling and waits for the sampling thread to finish.
+        :return:
+        """
+        self.stopped.set()
+        self.join()
+
+
+    def write_collapsed(self, file_path: str):
+        """
+        Writes the collected samples in collapsed-stack format, one stack per line
+        followed by its sample count, as consumed by flamegraph.pl and speedscope.
+
+        :param file_path: Path of the file to write
+        :return:
+        """
+        with open(file_path, "w") as collapsed_file:
+            for stack, count in self.samples.items():
+                collapsed_file.write(f"{stack} {count}\n")
+
+
+def start_profiling():
+    """
+    Starts profiling the calling thread of the current process.
+    Must be called from within the worker process, after it has been forked.
+    Does nothing unless profiling is enabled.
+    :return:
+    """
+    global sampler
+    if not PROFILING_ENABLED:
+        return
+    stage_stats.clear()
+    sampler = SamplingProfiler(threading.get_ident(), get_sampling_interval())
+    sampler.start()
+    get_logger(__name__).info(f"Profiling enabled on worker number {os.getpid()}.")
+
+
+def stop_profiling():
+    """
+    Stops profiling, writes the collapsed-stack samples for this worker
+    and logs a per-stage timing summary.
+    Does nothing unless profiling has been started.
+    :return:
+    """
+    global sampler
+    if sampler is None:
+        return
+    sampler.stop()
+    pid = os.getpid()
+    summary: list[str] = [f"Profiling summary for worker number {pid}:"]
+    for stage, stats in stage_stats.items():
+        summary.append(f"  {stage}: calls={stats.count} total={stats.total * 1000:.2f}ms "
+                       f"mean={stats.total / stats.count * 1000:.2f}ms max={stats.maximum * 1000:.2f}ms")
+    try:
+        if not os.path.exists(profile_path):
+            try:
+                os.makedirs(profile_path)
+            except FileExistsError:
+                pass
+        file_path = profile_path + "/consumer-" + str(pid) + ".collapsed"
+        sampler.write_collapsed(file_path)
+        summary.append(f"  {sum(sampler.samples.values())} stack samples written to {file_path}")
+    except OSError as e:
+        get_logger(__name__).error(f"Could not write profiling samples: {e}")
+    get_logger(__name__).info("\n".join(summary))
+    sampler = None